@@ -7,6 +7,7 @@ QPSK Receiver Application
 import sys
 import time
 import signal
+import logging
 import argparse
 from pathlib import Path
 
@@ -41,8 +42,11 @@ def main():
     
     args = parser.parse_args()
     
-    # Set debug mode
+    # Set debug mode (receiver diagnostics go through the logging module; only this
+    # package's loggers go to DEBUG, third-party libraries stay at WARNING)
     DEBUG_MODE = args.debug
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    logging.getLogger('src').setLevel(logging.DEBUG if DEBUG_MODE else logging.WARNING)
     
     # Configuration parameters
     samp_rate = DEFAULT_SAMP_RATE
@@ -79,7 +83,8 @@ def main():
             center_freq=center_freq,
             gain=gain,
             usrp_addr=usrp_addr,
-            antenna=antenna
+            antenna=antenna,
+            plot_data=args.plot and not args.terminal_only
         )
         
         if DEBUG_MODE:
@@ -2,28 +2,34 @@
 Common utilities and shared components for QPSK communication system
 """
 
+import functools
 import numpy as np
 from gnuradio import digital
 from gnuradio.filter import firdes
 
+# Ideal QPSK constellation points, indexed by symbol value
+QPSK_POINTS = np.array([-1-1j, -1+1j, 1+1j, 1-1j], dtype=np.complex64)
+
+@functools.lru_cache(maxsize=None)
 def create_constellation():
-    """Create QPSK constellation"""
+    """Create QPSK constellation (cached, shared by all callers)"""
     return digital.constellation_calcdist(
-        [-1-1j, -1+1j, 1+1j, 1-1j], 
+        QPSK_POINTS.tolist(), 
         [0, 1, 2, 3],
         4, 1, 
         digital.constellation.AMPLITUDE_NORMALIZATION
     ).base()
 
+@functools.lru_cache(maxsize=None)
 def create_rrc_taps(nfilts, samp_rate, sps, alpha):
-    """Create Root Raised Cosine filter taps"""
-    return firdes.root_raised_cosine(
+    """Create Root Raised Cosine filter taps (cached per parameter set, returned as a tuple)"""
+    return tuple(firdes.root_raised_cosine(
         nfilts, 
         nfilts * samp_rate, 
         samp_rate / sps, 
         alpha, 
         (11 * sps * nfilts)
-    )
+    ))
 
 # System parameters
 DEFAULT_SAMP_RATE = 1e6
@@ -57,6 +57,16 @@ class HammingDecoder:
             [1, 0, 1, 1, 0, 1, 0],
             [0, 1, 1, 1, 0, 0, 1]
         ], dtype=np.uint8)
+        
+        # Lookup tables indexed by 7-bit codeword value (first bit is the MSB)
+        self.codeword_weights = np.array([64, 32, 16, 8, 4, 2, 1], dtype=np.uint16)
+        self.nibble_lut = np.zeros(128, dtype=np.uint8)
+        self.corrected_lut = np.zeros(128, dtype=bool)
+        for codeword in range(128):
+            received_bits = [(codeword >> (6 - i)) & 1 for i in range(7)]
+            data_bits, error_corrected = self.decode_7bits(received_bits)
+            self.nibble_lut[codeword] = (data_bits[0] << 3) | (data_bits[1] << 2) | (data_bits[2] << 1) | data_bits[3]
+            self.corrected_lut[codeword] = error_corrected
     
     def decode_7bits(self, received_bits):
         """Decode 7-bit Hamming codeword and correct single-bit errors"""
@@ -86,30 +96,14 @@ class HammingDecoder:
     
     def decode_bytes(self, encoded_bits):
         """Decode a sequence of Hamming-encoded bits back to bytes"""
-        decoded_bytes = []
-        total_errors = 0
-        
         # Process 14 bits at a time (two 7-bit codewords = one byte)
-        for i in range(0, len(encoded_bits), 14):
-            if i + 14 <= len(encoded_bits):
-                # Decode high nibble (first 7 bits)
-                high_codeword = encoded_bits[i:i+7]
-                high_nibble, error1 = self.decode_7bits(high_codeword)
-                
-                # Decode low nibble (next 7 bits)
-                low_codeword = encoded_bits[i+7:i+14]
-                low_nibble, error2 = self.decode_7bits(low_codeword)
-                
-                if error1 or error2:
-                    total_errors += 1
-                
-                # Combine nibbles into byte (high nibble in upper 4 bits, low nibble in lower 4 bits)
-                byte_val = 0
-                for j in range(4):
-                    byte_val |= (int(high_nibble[j]) << (7-j))  # bits 7,6,5,4
-                for j in range(4):
-                    byte_val |= (int(low_nibble[j]) << (3-j))   # bits 3,2,1,0
-                
-                decoded_bytes.append(byte_val)
+        encoded_bits = np.asarray(encoded_bits, dtype=np.uint8)
+        num_bytes = len(encoded_bits) // 14
+        codewords = encoded_bits[:num_bytes * 14].reshape(num_bytes, 2, 7).dot(self.codeword_weights)
+        
+        # Decode both nibbles with a table lookup (high nibble first)
+        nibbles = self.nibble_lut[codewords]
+        decoded_bytes = (nibbles[:, 0] << 4) | nibbles[:, 1]
+        total_errors = int(np.count_nonzero(self.corrected_lut[codewords].any(axis=1)))
         
-        return bytes(decoded_bytes), total_errors
+        return decoded_bytes.tobytes(), total_errors
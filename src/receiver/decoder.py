@@ -2,73 +2,162 @@
 Packet decoder for QPSK receiver
 """
 
+import logging
 import numpy as np
-from collections import deque
 from ..common.hamming import HammingDecoder
 from ..common.packet import PacketProtocol
 
+logger = logging.getLogger(__name__)
+
+# Bits for each 2-bit QPSK symbol, MSB first
+_SYMBOL_BITS = np.array([[0, 0], [0, 1], [1, 0], [1, 1]], dtype=np.uint8)
+
+def _bits_to_int(bits):
+    """Pack a 0/1 bit array (MSB first) into a Python int"""
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big') >> (-len(bits) % 8)
+
 class PacketDecoder:
     """Decode packets with preamble, header, payload, and end marker"""
     
-    def __init__(self, debug=False):
+    def __init__(self):
         self.hamming = HammingDecoder()
-        self.debug = debug
         
-        # Packet structure constants from protocol
-        self.PREAMBLE = PacketProtocol.PREAMBLE
-        self.START_MARKER = PacketProtocol.START_MARKER
-        self.END_MARKER = PacketProtocol.END_MARKER
+        # Packet structure constants from protocol (contiguous uint8 for fast compares)
+        self.PREAMBLE = np.ascontiguousarray(PacketProtocol.PREAMBLE, dtype=np.uint8)
+        self.START_MARKER = np.ascontiguousarray(PacketProtocol.START_MARKER, dtype=np.uint8)
+        self.END_MARKER = np.ascontiguousarray(PacketProtocol.END_MARKER, dtype=np.uint8)
+        self._preamble_str = ''.join(map(str, self.PREAMBLE))
         
-        # For packet search
-        self.bit_buffer = deque(maxlen=1000)  # Circular buffer for incoming bits
+        # Markers packed into ints so bit errors are an XOR + popcount
+        self._start_marker_int = _bits_to_int(self.START_MARKER)
+        self._end_marker_int = _bits_to_int(self.END_MARKER)
+        
+        # For packet search: circular buffer for incoming bits, plus a scratch
+        # array used to unwrap it when the live bits straddle the end
+        self.buffer_capacity = 1000
+        self._buf = np.zeros(self.buffer_capacity, dtype=np.uint8)
+        self._scratch = np.empty(self.buffer_capacity, dtype=np.uint8)
+        self._head = 0
+        self._size = 0
         self.packets_received = 0
+        self._show_buffer_status = False
+        
+        # Preamble + start marker, searched in each new chunk (plus the bits carried over
+        # from the previous one) so the full buffer scan only runs once a sync word arrived.
+        # Bits are 0/1 bytes, so a C-level bytes search does the matching.
+        self._sync_template = np.concatenate([self.PREAMBLE, self.START_MARKER]).tobytes()
+        self._sync_tail = b''
+        self._sync_pending = False
     
     def find_pattern(self, data, pattern, max_errors=0):
         """Find pattern in data array with strict matching"""
         pattern_len = len(pattern)
-        best_pos = -1
-        min_errors = float('inf')
+        num_windows = len(data) - pattern_len + 1
+        if num_windows <= 0:
+            return -1
         
-        for i in range(len(data) - pattern_len + 1):
-            chunk = data[i:i+pattern_len]
-            errors = np.sum(chunk != pattern)
-            
-            if errors <= max_errors and errors < min_errors:
-                min_errors = errors
-                best_pos = i
-                if errors == 0:  # Perfect match found
-                    break
+        # Compare every window against the pattern in one pass (strided view, no copy)
+        data = np.ascontiguousarray(data)
+        windows = np.lib.stride_tricks.as_strided(
+            data, shape=(num_windows, pattern_len), strides=(data.strides[0], data.strides[0])
+        )
+        errors = np.count_nonzero(windows != pattern, axis=1)
         
-        return best_pos if min_errors <= max_errors else -1
+        # First position with the fewest errors (the first perfect match if there is one)
+        best_pos = int(np.argmin(errors))
+        return best_pos if errors[best_pos] <= max_errors else -1
+    
+    def print_buffer_status(self, buffer_array, preamble_pos):
+        """Log bit buffer status and preamble search result (debug)"""
+        logger.debug("Bit buffer: %d bits", len(buffer_array))
+        
+        # Show current preamble we're looking for
+        logger.debug("Looking for preamble: %s", self._preamble_str)
+        
+        if preamble_pos >= 0:
+            logger.debug("PERFECT preamble match found at position %d!", preamble_pos)
+        else:
+            # Show what we have at the beginning
+            first_bits = buffer_array[:min(len(self.PREAMBLE), len(buffer_array))]
+            first_str = (first_bits + np.uint8(ord('0'))).tobytes().decode('ascii')
+            logger.debug("First %d bits: %s", len(first_bits), first_str)
+    
+    def buffered_bits(self):
+        """Get the buffered bits, oldest first, as a contiguous array"""
+        end = self._head + self._size
+        if end <= self.buffer_capacity:
+            return self._buf[self._head:end]  # Zero-copy view
+        
+        first_len = self.buffer_capacity - self._head
+        self._scratch[:first_len] = self._buf[self._head:]
+        self._scratch[first_len:self._size] = self._buf[:self._size - first_len]
+        return self._scratch[:self._size]
+    
+    def store_bits(self, bits):
+        """Append bits to the circular buffer, dropping the oldest on overflow"""
+        capacity = self.buffer_capacity
+        if len(bits) >= capacity:
+            self._buf[:] = bits[-capacity:]
+            self._head = 0
+            self._size = capacity
+            return
+        
+        tail = (self._head + self._size) % capacity
+        first_len = min(len(bits), capacity - tail)
+        self._buf[tail:tail + first_len] = bits[:first_len]
+        self._buf[:len(bits) - first_len] = bits[first_len:]
+        
+        self._size += len(bits)
+        if self._size > capacity:
+            self._head = (self._head + self._size - capacity) % capacity
+            self._size = capacity
+    
+    def discard_bits(self, count):
+        """Drop the oldest count bits from the buffer"""
+        count = min(count, self._size)
+        self._head = (self._head + count) % self.buffer_capacity
+        self._size -= count
     
     def add_bits(self, new_bits):
-        """Add new bits to the buffer and try to decode packets"""
-        old_len = len(self.bit_buffer)
-        self.bit_buffer.extend(new_bits)
+        """Add new bits (bytes of 0/1 values or any bit sequence) and try to decode packets"""
+        if isinstance(new_bits, (bytes, bytearray, memoryview)):
+            new_bits = np.frombuffer(new_bits, dtype=np.uint8)  # Zero-copy
+        else:
+            new_bits = np.asarray(new_bits, dtype=np.uint8)
+        old_len = self._size
+        self.store_bits(new_bits)
         
-        # Debug: Show buffer status occasionally
-        if self.debug and len(self.bit_buffer) > old_len and len(self.bit_buffer) % 200 == 0:
-            print(f"Bit buffer: {len(self.bit_buffer)} bits")
-            
-            # Show current preamble we're looking for
-            preamble_str = ''.join(map(str, self.PREAMBLE))
-            print(f"Looking for preamble: {preamble_str}")
-            
-            # Check if we have the exact preamble pattern anywhere
-            buffer_array = np.array(list(self.bit_buffer), dtype=np.uint8)
-            if len(buffer_array) >= len(self.PREAMBLE):
-                # Try perfect match search across the buffer
-                perfect_match_pos = self.find_pattern(buffer_array, self.PREAMBLE, max_errors=0)
-                if perfect_match_pos >= 0:
-                    print(f"PERFECT preamble match found at position {perfect_match_pos}!")
-                else:
-                    # Show what we have at the beginning
-                    first_bits = buffer_array[:min(len(self.PREAMBLE), len(buffer_array))]
-                    first_str = ''.join(map(str, first_bits))
-                    print(f"First {len(first_bits)} bits: {first_str}")
+        # Debug: Show buffer status occasionally (printed once try_decode_packet has the buffer array)
+        if self._size > old_len and self._size % 200 == 0 and logger.isEnabledFor(logging.DEBUG):
+            self._show_buffer_status = True
+        
+        # Look for a sync word ending in the new bits
+        window = self._sync_tail + new_bits.tobytes()
+        if not self._sync_pending and window.find(self._sync_template) >= 0:
+            self._sync_pending = True
+        self._sync_tail = window[-(len(self._sync_template) - 1):]
+        
+        # Nothing to decode until a sync word is in the buffer
+        if not self._sync_pending and not self._show_buffer_status:
+            return None
         
         return self.try_decode_packet()
     
+    def add_symbols(self, symbols):
+        """Add QPSK symbols (bytes or any sequence of values 0..3) and try to decode packets"""
+        if isinstance(symbols, (bytes, bytearray, memoryview)):
+            symbols = np.frombuffer(symbols, dtype=np.uint8)
+        else:
+            symbols = np.asarray(symbols, dtype=np.uint8)
+        return self.add_bits(_SYMBOL_BITS[symbols].ravel())
+    
+    def reset(self):
+        """Clear the bit buffer and sync search state"""
+        self._head = 0
+        self._size = 0
+        self._sync_tail = b''
+        self._sync_pending = False
+    
     def try_decode_packet(self):
         """Try to decode a packet from the current bit buffer"""
         min_packet_size = (len(self.PREAMBLE) + len(self.START_MARKER) + 
@@ -76,16 +165,20 @@ class PacketDecoder:
                           PacketProtocol.MIN_PAYLOAD_LENGTH * 14 + 
                           len(self.END_MARKER))
         
-        if len(self.bit_buffer) < min_packet_size:
+        if self._size < min_packet_size:
             return None  # Not enough data for a minimal packet
         
-        # Convert deque to numpy array for processing
-        buffer_array = np.array(list(self.bit_buffer), dtype=np.uint8)
+        buffer_array = self.buffered_bits()
         
         # Look for preamble (require perfect match)
         preamble_pos = self.find_pattern(buffer_array, self.PREAMBLE, max_errors=0)
         
+        if self._show_buffer_status:
+            self._show_buffer_status = False
+            self.print_buffer_status(buffer_array, preamble_pos)
+        
         if preamble_pos == -1:
+            self._sync_pending = False  # Every sync word seen so far has been consumed
             return None
         
         # Look for start marker after preamble
@@ -94,12 +187,10 @@ class PacketDecoder:
             return None
         
         start_marker_data = buffer_array[expected_start_pos:expected_start_pos + len(self.START_MARKER)]
-        start_marker_errors = np.sum(start_marker_data != self.START_MARKER)
+        start_marker_errors = bin(_bits_to_int(start_marker_data) ^ self._start_marker_int).count('1')
         if start_marker_errors > 0:  # Require perfect match for start marker
             # Remove processed bits and try again
-            for _ in range(preamble_pos + 1):
-                if self.bit_buffer:
-                    self.bit_buffer.popleft()
+            self.discard_bits(preamble_pos + 1)
             return None
         
         # Try to decode header (4 bytes = 56 encoded bits)
@@ -123,9 +214,7 @@ class PacketDecoder:
             if (payload_length < PacketProtocol.MIN_PAYLOAD_LENGTH or 
                 payload_length > PacketProtocol.MAX_PAYLOAD_LENGTH):
                 # Invalid payload length, probably not a real packet
-                for _ in range(preamble_pos + 1):
-                    if self.bit_buffer:
-                        self.bit_buffer.popleft()
+                self.discard_bits(preamble_pos + 1)
                 return None
             
             # Calculate expected payload encoded length
@@ -146,21 +235,17 @@ class PacketDecoder:
             
             # Check end marker (require perfect match)
             end_marker_data = buffer_array[end_marker_start:end_marker_end]
-            end_marker_errors = np.sum(end_marker_data != self.END_MARKER)
+            end_marker_errors = bin(_bits_to_int(end_marker_data) ^ self._end_marker_int).count('1')
             if end_marker_errors > 0:  # Require perfect match for end marker
                 # Remove processed bits and try again
-                for _ in range(preamble_pos + 1):
-                    if self.bit_buffer:
-                        self.bit_buffer.popleft()
+                self.discard_bits(preamble_pos + 1)
                 return None
             
             # Successful packet decode
             self.packets_received += 1
             
             # Remove the decoded packet from buffer
-            for _ in range(end_marker_end):
-                if self.bit_buffer:
-                    self.bit_buffer.popleft()
+            self.discard_bits(end_marker_end)
             
             # Return decoded packet info
             packet_info = {
@@ -176,10 +261,7 @@ class PacketDecoder:
             return packet_info
             
         except Exception as e:
-            if self.debug:
-                print(f"Packet decode error: {e}")
+            logger.debug("Packet decode error: %s", e)
             # Remove some bits and try again
-            for _ in range(preamble_pos + 1):
-                if self.bit_buffer:
-                    self.bit_buffer.popleft()
+            self.discard_bits(preamble_pos + 1)
             return None
@@ -2,6 +2,7 @@
 Packet display utilities for receiver
 """
 
+import math
 import time
 import threading
 import numpy as np
@@ -48,6 +49,7 @@ INTERACTIVE_PLOTTING_AVAILABLE = set_matplotlib_backend()
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.patches import Circle
+from ..common import QPSK_POINTS
 
 try:
     from scipy import signal as scipy_signal
@@ -68,13 +70,14 @@ def display_packets_terminal(receiver, update_interval=1.0):
     
     try:
         while True:
-            # Get signal power for detection
-            signal_power = receiver.get_signal_power()
-            power_db = 10 * np.log10(signal_power + 1e-10)  # Convert to dB, avoid log(0)
-            
-            # Show signal status periodically (only in debug mode)
-            if receiver.debug and int(time.time()) % 10 == 0:  # Every 10 seconds
-                print(f"Signal power: {power_db:.1f} dB")
+            # Signal power is only reported in debug mode, so skip the dB conversion otherwise
+            if receiver.debug:
+                signal_power = receiver.get_signal_power()
+                power_db = 10 * math.log10(signal_power + 1e-10)  # Convert to dB, avoid log(0)
+                
+                # Show signal status periodically
+                if int(time.time()) % 10 == 0:  # Every 10 seconds
+                    print(f"Signal power: {power_db:.1f} dB")
             
             # Check for new packets
             latest_packet = receiver.get_latest_packet()
@@ -150,11 +153,16 @@ def start_terminal_display(receiver, update_interval=0.5):
 class LivePlotDisplay:
     """Live plotting display for constellation, time domain, and frequency domain"""
     
-    def __init__(self, receiver, update_interval=0.2):
+    def __init__(self, receiver, update_interval=0.2, stats_skip=5):
         self.receiver = receiver
         self.update_interval = update_interval
         self.running = False
         
+        # Statistics and packet text only refresh every stats_skip frames
+        self.stats_skip = max(1, int(stats_skip))
+        self._tick = 0
+        self.start_time = time.time()  # Reset when the display starts
+        
         # Data buffers
         self.constellation_data = []
         self.time_data = []
@@ -162,6 +170,11 @@ class LivePlotDisplay:
         self.time_axis = []
         self.freq_axis = []
         
+        # FFT windows and plot axes cached by length
+        self._windows = {}
+        self._time_axes = {}
+        self._freq_axes = {}
+        
         # Figure setup
         plt.style.use('dark_background')
         self.fig, self.axes = plt.subplots(2, 2, figsize=(12, 10))
@@ -183,10 +196,8 @@ class LivePlotDisplay:
         self.ax_const.add_patch(circle1)
         self.ax_const.add_patch(circle2)
         
-        # Ideal QPSK constellation points
-        ideal_points = [-1-1j, -1+1j, 1+1j, 1-1j]
-        for point in ideal_points:
-            self.ax_const.plot(point.real, point.imag, 'ro', markersize=8, alpha=0.7)
+        # Ideal QPSK constellation points (one artist for all four)
+        self.ax_const.plot(QPSK_POINTS.real, QPSK_POINTS.imag, 'ro', markersize=8, alpha=0.7)
         
         self.const_scatter = self.ax_const.scatter([], [], c='cyan', alpha=0.6, s=20)
         
@@ -199,7 +210,7 @@ class LivePlotDisplay:
         
         self.line_time_i, = self.ax_time.plot([], [], 'c-', label='I component', alpha=0.8)
         self.line_time_q, = self.ax_time.plot([], [], 'm-', label='Q component', alpha=0.8)
-        self.ax_time.legend()
+        self.time_legend = self.ax_time.legend()
         
         # Frequency domain plot (bottom left)
         self.ax_freq = self.axes[1, 0]
@@ -228,6 +239,11 @@ class LivePlotDisplay:
         # Tight layout
         plt.tight_layout()
         
+        # Artists redrawn every frame (blitted against a cached background); the legend
+        # comes after the traces so it is redrawn on top of them instead of under them
+        self.animated_artists = [self.const_scatter, self.line_time_i, self.line_time_q,
+                                 self.time_legend, self.line_freq, self.stats_text, self.packet_text]
+        
         # Animation
         self.ani = None
     
@@ -236,14 +252,13 @@ class LivePlotDisplay:
         if not self.running:
             return []
         
+        limits_changed = False
+        
         try:
             # Get constellation data
-            constellation_data = self.receiver.get_constellation_data()
-            if len(constellation_data) > 0:
-                # Take recent data points
-                recent_const = constellation_data[-500:] if len(constellation_data) > 500 else constellation_data
-                if len(recent_const) > 0:
-                    self.const_scatter.set_offsets(np.column_stack([recent_const.real, recent_const.imag]))
+            recent_const = self.receiver.get_constellation_data()[-500:]
+            if len(recent_const) > 0:
+                self.const_scatter.set_offsets(np.column_stack([recent_const.real, recent_const.imag]))
             
             # Get time domain data from symbol sync output
             time_data = self.receiver.get_symbol_sync_data()
@@ -251,7 +266,7 @@ class LivePlotDisplay:
                 # Take recent samples
                 recent_time = time_data[-1000:] if len(time_data) > 1000 else time_data
                 if len(recent_time) > 0:
-                    time_samples = np.arange(len(recent_time))
+                    time_samples = self.get_time_axis(len(recent_time))
                     i_component = np.real(recent_time)
                     q_component = np.imag(recent_time)
                     
@@ -260,67 +275,109 @@ class LivePlotDisplay:
                     
                     # Auto-scale time domain plot
                     if len(recent_time) > 1:
-                        self.ax_time.set_xlim(0, len(recent_time))
                         y_min = min(np.min(i_component), np.min(q_component))
                         y_max = max(np.max(i_component), np.max(q_component))
                         margin = (y_max - y_min) * 0.1
-                        self.ax_time.set_ylim(y_min - margin, y_max + margin)
+                        limits_changed |= self.update_axis_limits(
+                            self.ax_time, (0, len(recent_time)), (y_min - margin, y_max + margin)
+                        )
                     
                     # Compute and display frequency domain
                     if len(recent_time) > 64:  # Need enough samples for meaningful FFT
                         # Apply window to reduce spectral leakage
-                        if scipy_signal:
-                            windowed_data = recent_time * scipy_signal.windows.hann(len(recent_time))
-                        else:
-                            # Simple hanning window implementation
-                            n = len(recent_time)
-                            window = 0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(n) / (n - 1))
-                            windowed_data = recent_time * window
+                        windowed_data = recent_time * self.get_window(len(recent_time))
                         
                         # Compute FFT
                         fft_data = fft(windowed_data)
-                        fft_freqs = fftfreq(len(windowed_data), 1/self.receiver.samp_rate)
                         
-                        # Convert to power spectrum in dB
-                        power_spectrum = 20 * np.log10(np.abs(fft_data) + 1e-12)
-                        
-                        # Only plot positive frequencies
-                        positive_freqs = fft_freqs[:len(fft_freqs)//2]
-                        positive_power = power_spectrum[:len(power_spectrum)//2]
+                        # Only plot positive frequencies, so only convert those to dB
+                        positive_freqs = self.get_freq_axis(len(windowed_data))
+                        positive_power = 20 * np.log10(np.abs(fft_data[:len(positive_freqs)]) + 1e-12)
                         
                         self.line_freq.set_data(positive_freqs, positive_power)
                         
                         # Auto-scale frequency domain plot
                         if len(positive_freqs) > 1:
-                            self.ax_freq.set_xlim(0, positive_freqs[-1])
-                            self.ax_freq.set_ylim(np.min(positive_power), np.max(positive_power) + 5)
+                            limits_changed |= self.update_axis_limits(
+                                self.ax_freq, (0, positive_freqs[-1]),
+                                (np.min(positive_power), np.max(positive_power) + 5)
+                            )
             
-            # Update signal statistics
-            self.update_statistics()
+            # Update signal statistics and packet information (decimated, text changes slowly)
+            if self._tick % self.stats_skip == 0:
+                self.update_statistics()
+                self.update_packet_display()
+            self._tick += 1
             
-            # Update packet information
-            self.update_packet_display()
+            # Blitting only redraws the artists, so refresh the axes background
+            # (ticks, labels) when the limits have moved
+            if limits_changed:
+                self.fig.canvas.draw()
             
         except Exception as e:
             if self.receiver.debug:
                 print(f"Plot update error: {e}")
         
-        return []
+        return self.animated_artists
+    
+    def update_axis_limits(self, ax, xlim, ylim):
+        """Set axis limits only when they move by more than 10% of the current span"""
+        changed = False
+        for get_lim, set_lim, new_lim in ((ax.get_xlim, ax.set_xlim, xlim),
+                                          (ax.get_ylim, ax.set_ylim, ylim)):
+            low, high = get_lim()
+            tolerance = 0.1 * (high - low)
+            if abs(new_lim[0] - low) > tolerance or abs(new_lim[1] - high) > tolerance:
+                set_lim(*new_lim)
+                changed = True
+        return changed
+    
+    def get_window(self, n):
+        """Get a float32 Hann window of length n, computing it only once per length"""
+        window = self._windows.get(n)
+        if window is None:
+            if scipy_signal:
+                window = scipy_signal.windows.hann(n)
+            else:
+                # Simple hanning window implementation
+                window = 0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(n) / (n - 1))
+            # float32 keeps the windowed complex64 samples (and their FFT) single precision
+            window = window.astype(np.float32)
+            self._windows[n] = window
+        return window
+    
+    def get_time_axis(self, n):
+        """Get the sample index axis 0..n-1, computing it only once per length"""
+        axis = self._time_axes.get(n)
+        if axis is None:
+            axis = np.arange(n, dtype=np.float32)
+            self._time_axes[n] = axis
+        return axis
+    
+    def get_freq_axis(self, n):
+        """Get the positive-frequency axis of an n-point FFT, computing it only once per length"""
+        axis = self._freq_axes.get(n)
+        if axis is None:
+            axis = fftfreq(n, 1/self.receiver.samp_rate)[:n//2].astype(np.float32)
+            self._freq_axes[n] = axis
+        return axis
     
     def update_statistics(self):
         """Update signal statistics display"""
         try:
             # Get current signal power
             signal_power = self.receiver.get_signal_power()
-            power_db = 10 * np.log10(signal_power + 1e-10)
+            power_db = 10 * math.log10(signal_power + 1e-10)
             
             # Get symbol and bit data
-            symbols = self.receiver.get_symbol_data()
-            bits = list(self.receiver.vector_sink_bits.data()) if hasattr(self.receiver, 'vector_sink_bits') else []
+            symbol_count = self.receiver.get_symbol_count()
+            bit_count = self.receiver.get_bit_count()
             
             # Calculate rates
-            symbol_rate = len(symbols) / max(1, time.time() - getattr(self, 'start_time', time.time()))
-            bit_rate = len(bits) / max(1, time.time() - getattr(self, 'start_time', time.time()))
+            now = time.time()
+            elapsed = max(1, now - self.start_time)
+            symbol_rate = symbol_count / elapsed
+            bit_rate = bit_count / elapsed
             expected_symbol_rate = self.receiver.samp_rate / self.receiver.sps
             
             # Get constellation data for EVM calculation
@@ -329,34 +386,27 @@ class LivePlotDisplay:
             snr_est = 0.0
             
             if len(constellation_data) > 10:
-                recent_const = constellation_data[-100:] if len(constellation_data) > 100 else constellation_data
+                recent_const = constellation_data[-100:]
                 
                 # Calculate EVM (Error Vector Magnitude)
-                ideal_points = np.array([-1-1j, -1+1j, 1+1j, 1-1j])
-                
-                # Find closest ideal point for each received point
-                errors = []
-                for point in recent_const:
-                    distances = np.abs(point - ideal_points)
-                    closest_ideal = ideal_points[np.argmin(distances)]
-                    error = np.abs(point - closest_ideal)
-                    errors.append(error)
+                # The ideal points sit at ±1±1j, so the closest one is picked by the
+                # sign of each component and the error reduces to the offset of |I|, |Q| from 1
+                errors_sq = (np.abs(recent_const.real) - 1)**2 + (np.abs(recent_const.imag) - 1)**2
                 
-                if errors:
-                    evm_rms = np.sqrt(np.mean(np.array(errors)**2)) * 100  # Convert to percentage
+                if len(errors_sq) > 0:
+                    noise_power_est = np.mean(errors_sq)
+                    evm_rms = np.sqrt(noise_power_est) * 100  # Convert to percentage
                     
                     # Estimate SNR from constellation
                     signal_power_est = np.mean(np.abs(recent_const)**2)
-                    noise_power_est = np.mean(np.array(errors)**2)
                     if noise_power_est > 1e-12:
                         snr_est = 10 * np.log10(signal_power_est / noise_power_est)
             
             # Symbol distribution
             symbol_dist = [0, 0, 0, 0]
-            if len(symbols) > 0:
-                recent_symbols = symbols[-100:] if len(symbols) > 100 else symbols
-                for i in range(4):
-                    symbol_dist[i] = recent_symbols.count(i)
+            if symbol_count > 0:
+                recent_symbols = self.receiver.get_symbol_data(100)
+                symbol_dist = np.bincount(recent_symbols, minlength=4)[:4].tolist()
             
             # Format statistics text
             stats_text = f"""SIGNAL STATISTICS
@@ -378,8 +428,8 @@ Sym 2: {symbol_dist[2]:4d}  Sym 3: {symbol_dist[3]:4d}
 
 DATA COUNTERS
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Total Symbols: {len(symbols):6d}
-Total Bits:    {len(bits):6d}"""
+Total Symbols: {symbol_count:6d}
+Total Bits:    {bit_count:6d}"""
             
             self.stats_text.set_text(stats_text)
             
@@ -434,7 +484,7 @@ Total Bits:    {len(bits):6d}"""
             self.ani = animation.FuncAnimation(
                 self.fig, self.update_plot, 
                 interval=int(self.update_interval * 1000),  # Convert to milliseconds
-                blit=False, cache_frame_data=False
+                blit=True, cache_frame_data=False
             )
             
             # Show the plot and start event loop
@@ -457,7 +507,7 @@ Total Bits:    {len(bits):6d}"""
             self.ani = animation.FuncAnimation(
                 self.fig, self.update_plot, 
                 interval=int(self.update_interval * 1000),  # Convert to milliseconds
-                blit=False, cache_frame_data=False
+                blit=True, cache_frame_data=False
             )
             
             # Show the plot without blocking
@@ -3,24 +3,90 @@ QPSK Receiver implementation
 """
 
 import numpy as np
+import os
 import time
+import queue
 import threading
 import math
+import logging
+import functools
 from gnuradio import gr, blocks, digital, analog, filter
 from ..common import create_constellation, create_rrc_taps
 from ..common.usrp_config import setup_usrp_source
 from .decoder import PacketDecoder
 
+logger = logging.getLogger(__name__)
+
+@functools.lru_cache(maxsize=None)
+def _lpf_taps(samp_rate, sps):
+    """Low-pass taps for cleaning up the signal before synchronization (cached)"""
+    return tuple(filter.firdes.low_pass(
+        1.0,                    # gain
+        samp_rate,              # sampling rate
+        samp_rate / sps * 0.6,  # cutoff frequency
+        samp_rate / sps * 0.2   # transition width
+    ))
+
+class SymbolQueueSink(gr.sync_block):
+    """Sink that hands each batch of 2-bit symbols to a Python queue"""
+    
+    def __init__(self):
+        gr.sync_block.__init__(self, name="Symbol Queue Sink", in_sig=[np.uint8], out_sig=None)
+        self.queue = queue.Queue()
+    
+    def work(self, input_items, output_items):
+        self.queue.put(input_items[0].tobytes())
+        return len(input_items[0])
+
+class RingSink(gr.sync_block):
+    """Sink that keeps the most recent items (symbols or samples) in a fixed-size circular buffer"""
+    
+    def __init__(self, capacity=4096, dtype=np.uint8):
+        gr.sync_block.__init__(self, name="Ring Sink", in_sig=[dtype], out_sig=None)
+        self.capacity = capacity
+        self._buf = np.zeros(capacity, dtype=dtype)
+        self.count = 0  # Total items written since the last reset
+        self._lock = threading.Lock()
+    
+    def work(self, input_items, output_items):
+        items = input_items[0]
+        data = items[-self.capacity:]
+        with self._lock:
+            start = (self.count + len(items) - len(data)) % self.capacity
+            first_len = min(len(data), self.capacity - start)
+            self._buf[start:start + first_len] = data[:first_len]
+            self._buf[:len(data) - first_len] = data[first_len:]
+            self.count += len(items)
+        return len(items)
+    
+    def recent(self, n):
+        """Get a copy of the last n items (fewer if not yet available), oldest first"""
+        with self._lock:
+            n = min(n, self.count, self.capacity)
+            end = self.count % self.capacity
+            if n <= end:
+                return self._buf[end - n:end].copy()
+            return np.concatenate([self._buf[self.capacity - (n - end):], self._buf[:end]])
+    
+    def reset(self):
+        """Forget all stored items"""
+        with self._lock:
+            self.count = 0
+
 class PacketQPSKReceiver(gr.top_block):
     """Packet-based QPSK Receiver Flow Graph"""
     
     def __init__(self, debug=False, samp_rate=1e6, center_freq=5e9, gain=20, 
-                 usrp_addr="addr=192.168.10.16", antenna="J2"):
+                 usrp_addr="addr=192.168.10.16", antenna="J2", plot_data=False):
         gr.top_block.__init__(self, "Packet QPSK Receiver")
         
         # Debug flag to control verbose output
         self.debug = debug
         
+        # Only capture constellation/symbol sync samples when something displays them
+        self.capture_plot_data = plot_data or debug
+        self._last_power_db = float('-inf')  # Last signal power reading in dB (debug output)
+        
         # Parameters
         self.samp_rate = samp_rate
         self.center_freq = center_freq
@@ -36,10 +102,15 @@ class PacketQPSKReceiver(gr.top_block):
         self.rrc_taps = create_rrc_taps(self.nfilts, self.samp_rate, self.sps, self.alpha)
         
         # Packet decoder
-        self.packet_decoder = PacketDecoder(debug=self.debug)
+        self.packet_decoder = PacketDecoder()
         self.latest_packet = None
         self.packet_lock = threading.Lock()
         
+        # Constellation snapshot for the display: the bit thread replaces it with a
+        # fresh read-only array, so a returned snapshot never changes afterwards
+        self.constellation_snapshot_size = 500
+        self._const_snapshot = np.zeros(0, dtype=np.complex64)
+        
         # Setup blocks
         self.setup_blocks()
         self.connect_blocks()
@@ -62,13 +133,7 @@ class PacketQPSKReceiver(gr.top_block):
         self.agc = analog.agc_cc(1e-4, 1.0, 1.0, 65536)
         
         # Low-pass filter to clean up signal before synchronization
-        lpf_taps = filter.firdes.low_pass(
-            1.0,                    # gain
-            self.samp_rate,         # sampling rate
-            self.samp_rate / self.sps * 0.6,  # cutoff frequency
-            self.samp_rate / self.sps * 0.2   # transition width
-        )
-        self.lpf = filter.fir_filter_ccc(1, lpf_taps)
+        self.lpf = filter.fir_filter_ccc(1, _lpf_taps(self.samp_rate, self.sps))
         
         # Frequency correction
         self.freq_xlating_fir_filter = filter.freq_xlating_fir_filter_ccc(
@@ -105,21 +170,22 @@ class PacketQPSKReceiver(gr.top_block):
             self.constellation.arity(), digital.DIFF_DIFFERENTIAL
         )
         
-        # Unpack bits from symbols
-        self.unpack_k_bits = blocks.unpack_k_bits_bb(2)  # QPSK = 2 bits per symbol
-        
-        # Data sinks
-        self.vector_sink_constellation = blocks.vector_sink_c()
-        self.vector_sink_bits = blocks.vector_sink_b()
-        self.vector_sink_symbols = blocks.vector_sink_b()
-        self.vector_sink_clock_recovery = blocks.vector_sink_c()
+        # Data sinks (decoded symbols are unpacked to bits by the packet decoder)
+        self.decoded_symbol_sink = SymbolQueueSink()
+        self.bit_count = 0  # Bits received since the last reset
+        self.symbol_sink = RingSink()
+        if self.capture_plot_data:
+            # Plot data only ever needs a recent window, so keep it in fixed-size rings
+            self.constellation_sink = RingSink(self.constellation_snapshot_size, np.complex64)
+            self.clock_recovery_sink = RingSink(2048, np.complex64)
+        else:
+            self.null_sink_constellation = blocks.null_sink(gr.sizeof_gr_complex * 1)
         
         # Power measurement
         self.power_probe = blocks.probe_signal_f()
         self.complex_to_mag_squared = blocks.complex_to_mag_squared()
-        self.moving_average = blocks.moving_average_ff(
-            int(self.samp_rate/100), 1.0/int(self.samp_rate/100), 4000
-        )
+        # Single-pole IIR smoothing with the same ~10 ms time constant as a samp_rate/100 boxcar
+        self.power_average = filter.single_pole_iir_filter_ff(1.0/int(self.samp_rate/100))
         
         # Null sinks for unused outputs
         self.null_sink1 = blocks.null_sink(gr.sizeof_float * 1)
@@ -136,21 +202,23 @@ class PacketQPSKReceiver(gr.top_block):
         self.connect((self.lpf, 0), (self.fll_band_edge, 0))
         self.connect((self.fll_band_edge, 0), (self.skiphead, 0))
         self.connect((self.skiphead, 0), (self.symbol_sync, 0))
-        self.connect((self.symbol_sync, 0), (self.vector_sink_clock_recovery, 0))
         self.connect((self.symbol_sync, 0), (self.decimator, 0))
         self.connect((self.decimator, 0), (self.constellation_receiver, 0))
-        self.connect((self.constellation_receiver, 0), (self.vector_sink_symbols, 0))
+        self.connect((self.constellation_receiver, 0), (self.symbol_sink, 0))
         self.connect((self.constellation_receiver, 0), (self.diff_decoder, 0))
-        self.connect((self.diff_decoder, 0), (self.unpack_k_bits, 0))
-        self.connect((self.unpack_k_bits, 0), (self.vector_sink_bits, 0))
+        self.connect((self.diff_decoder, 0), (self.decoded_symbol_sink, 0))
         
-        # Constellation data collection
-        self.connect((self.constellation_receiver, 4), (self.vector_sink_constellation, 0))
+        # Constellation and symbol sync data collection (for plotting)
+        if self.capture_plot_data:
+            self.connect((self.symbol_sync, 0), (self.clock_recovery_sink, 0))
+            self.connect((self.constellation_receiver, 4), (self.constellation_sink, 0))
+        else:
+            self.connect((self.constellation_receiver, 4), (self.null_sink_constellation, 0))
         
         # Power measurement
         self.connect((self.fll_band_edge, 0), (self.complex_to_mag_squared, 0))
-        self.connect((self.complex_to_mag_squared, 0), (self.moving_average, 0))
-        self.connect((self.moving_average, 0), (self.power_probe, 0))
+        self.connect((self.complex_to_mag_squared, 0), (self.power_average, 0))
+        self.connect((self.power_average, 0), (self.power_probe, 0))
         
         # Connect unused outputs to null sinks
         self.connect((self.constellation_receiver, 1), (self.null_sink1, 0))
@@ -159,8 +227,43 @@ class PacketQPSKReceiver(gr.top_block):
     
     def start(self):
         """Start the receiver and bit processing"""
+        # Smaller scheduler buffers hand decoded symbols to the bit thread in low-latency batches
+        self.set_max_noutput_items(4096)
+        bit_cpu = self.reserve_bit_cpu()
         super().start()
         self.bit_thread.start()
+        if bit_cpu is not None:
+            self.pin_bit_thread(bit_cpu)
+    
+    def reserve_bit_cpu(self):
+        """
+        Keep the last CPU free for the bit processing thread (Linux only, needs more than one CPU)
+        
+        Narrows the calling thread to the other CPUs, so the GNU Radio scheduler threads
+        created by start() inherit that mask. Threads that already exist (such as UHD
+        threads created when the device was opened) keep their own mask.
+        
+        Returns:
+            The reserved CPU, or None if affinity cannot be set
+        """
+        if not hasattr(os, 'sched_setaffinity') or not hasattr(threading.Thread, 'native_id'):
+            return None
+        try:
+            cpus = sorted(os.sched_getaffinity(0))
+            if len(cpus) < 2:
+                return None
+            os.sched_setaffinity(0, cpus[:-1])
+            return cpus[-1]
+        except OSError as e:
+            logger.debug("Could not reserve a CPU for the bit thread: %s", e)
+            return None
+    
+    def pin_bit_thread(self, cpu):
+        """Pin the bit processing thread to the CPU kept free by reserve_bit_cpu"""
+        try:
+            os.sched_setaffinity(self.bit_thread.native_id, {cpu})
+        except OSError as e:
+            logger.debug("Could not set bit thread affinity: %s", e)
     
     def stop(self):
         """Stop the receiver and bit processing"""
@@ -169,118 +272,135 @@ class PacketQPSKReceiver(gr.top_block):
     
     def bit_processing_loop(self):
         """Process incoming bits for packet decoding"""
-        last_bit_count = 0
         bit_rate_counter = 0
-        last_time = time.time()
         last_symbol_count = 0
         stuck_counter = 0
-        last_power_check = 0
         power_threshold = 1e-8
         signal_detected = False
         
-        if self.debug:
-            print("Bit processing thread started...")
+        # Periodic work is scheduled as absolute deadlines on the monotonic clock
+        last_time = time.monotonic()
+        next_power_check = last_time
+        next_snapshot = last_time
+        next_rate_report = last_time + 5.0
+        
+        logger.debug("Bit processing thread started...")
         
         while self.process_bits:
             try:
+                # Wait for the flow graph to produce symbols, then take everything queued
+                try:
+                    chunks = [self.decoded_symbol_sink.queue.get(timeout=1.0)]
+                except queue.Empty:
+                    chunks = []
+                while True:
+                    try:
+                        chunks.append(self.decoded_symbol_sink.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                new_symbols = b''.join(chunks)
+                
                 # Check signal power periodically
                 current_power = self.get_signal_power()
-                current_time = time.time()
+                current_time = time.monotonic()
                 
                 # Check for signal presence every 2 seconds
-                if current_time - last_power_check >= 2.0:
-                    power_db = 10 * np.log10(current_power + 1e-10)
+                if current_time >= next_power_check:
+                    # Power in dB is only used for debug output
+                    if logger.isEnabledFor(logging.DEBUG):
+                        self._last_power_db = 10.0 * math.log10(current_power + 1e-10)
                     
                     # Detect signal presence
                     if current_power > power_threshold:
                         if not signal_detected:
-                            if self.debug:
-                                print(f"Signal detected! Power: {power_db:.1f} dB")
+                            logger.debug("Signal detected! Power: %.1f dB", self._last_power_db)
                             signal_detected = True
                             self.reset_for_new_signal()
+                            last_symbol_count = 0
+                            new_symbols = b''  # Symbols queued before the reset belong to the old signal
                     else:
                         if signal_detected:
-                            if self.debug:
-                                print(f"Signal lost! Power: {power_db:.1f} dB")
+                            logger.debug("Signal lost! Power: %.1f dB", self._last_power_db)
                             signal_detected = False
                     
-                    last_power_check = current_time
+                    next_power_check = current_time + 2.0
                 
-                # Get new bits
-                current_bits = list(self.vector_sink_bits.data())
+                # Refresh the constellation snapshot for the display (at most 10 times a second)
+                if self.capture_plot_data and current_time >= next_snapshot:
+                    self.update_constellation_snapshot()
+                    next_snapshot = current_time + 0.1
                 
-                if len(current_bits) > last_bit_count:
-                    # Process new bits
-                    new_bits = current_bits[last_bit_count:]
+                if len(new_symbols) > 0:
+                    new_bit_count = 2 * len(new_symbols)  # QPSK = 2 bits per symbol
+                    self.bit_count += new_bit_count
                     
                     # Check symbol recovery too
-                    current_symbols = self.get_symbol_data()
-                    current_symbol_count = len(current_symbols)
+                    current_symbol_count = self.get_symbol_count()
                     
                     # Debug: Show bit rate and symbol rate periodically
-                    bit_rate_counter += len(new_bits)
-                    if self.debug and current_time - last_time >= 5.0:
+                    bit_rate_counter += new_bit_count
+                    if current_time >= next_rate_report and logger.isEnabledFor(logging.DEBUG):
                         bit_rate = bit_rate_counter / (current_time - last_time)
                         symbol_rate = (current_symbol_count - last_symbol_count) / (current_time - last_time)
                         expected_symbol_rate = self.samp_rate / self.sps
                         
-                        print(f"Bit rate: {bit_rate:.1f} bits/sec, Symbol rate: {symbol_rate:.1f} sym/sec")
-                        print(f"Expected symbol rate: {expected_symbol_rate:.1f} sym/sec")
-                        print(f"Signal detected: {signal_detected}, Power: {10 * np.log10(current_power + 1e-10):.1f} dB")
+                        logger.debug("Bit rate: %.1f bits/sec, Symbol rate: %.1f sym/sec", bit_rate, symbol_rate)
+                        logger.debug("Expected symbol rate: %.1f sym/sec", expected_symbol_rate)
+                        logger.debug("Signal detected: %s, Power: %.1f dB", signal_detected, self._last_power_db)
                         
                         bit_rate_counter = 0
                         last_time = current_time
+                        next_rate_report = current_time + 5.0
                         last_symbol_count = current_symbol_count
                     
                     # Only process bits if we have signal and reasonable symbol diversity
-                    if signal_detected and len(current_symbols) > 20:
-                        recent_symbols = current_symbols[-20:]
-                        unique_symbols = len(set(recent_symbols))
+                    if signal_detected and current_symbol_count > 20:
+                        recent_symbols = self.get_symbol_data(20)
                         
-                        # Check if we have at least 2 different symbols
-                        if unique_symbols >= 2:
+                        # Check if we have at least 2 different symbols (compared on the array, no list copy)
+                        if np.any(recent_symbols != recent_symbols[0]):
                             # Try to decode packet
-                            packet = self.packet_decoder.add_bits(new_bits)
+                            packet = self.packet_decoder.add_symbols(new_symbols)
                             
                             if packet:
-                                if self.debug:
-                                    print(f"Packet decoded! Bits processed: {len(current_bits)}")
+                                logger.debug("Packet decoded! Bits processed: %d", self.bit_count)
                                 stuck_counter = 0
                                 with self.packet_lock:
                                     self.latest_packet = packet
                         else:
-                            if self.debug and signal_detected:
-                                print("Skipping packet decode - no symbol diversity despite signal")
-                    
-                    last_bit_count = len(current_bits)
-                    
-                    # Reset sink periodically to avoid memory issues
-                    if len(current_bits) > 15000:
-                        if self.debug:
-                            print(f"Resetting bit sink after {len(current_bits)} bits")
-                        self.vector_sink_bits.reset()
-                        self.vector_sink_symbols.reset()
-                        last_bit_count = 0
-                        last_symbol_count = 0
-                
-                time.sleep(0.1)
+                            logger.debug("Skipping packet decode - no symbol diversity despite signal")
                 
             except Exception as e:
-                if self.debug:
-                    print(f"Bit processing error: {e}")
+                logger.debug("Bit processing error: %s", e)
                 time.sleep(0.1)
     
+    def update_constellation_snapshot(self):
+        """Replace the constellation snapshot with the most recent points"""
+        snapshot = self.constellation_sink.recent(self.constellation_snapshot_size)
+        snapshot.flags.writeable = False
+        self._const_snapshot = snapshot  # Single reference assignment, atomic for readers
+    
     def get_constellation_data(self):
-        """Get constellation data for plotting"""
-        return np.array(self.vector_sink_constellation.data())
+        """Get constellation data for plotting (latest read-only snapshot, valid indefinitely)"""
+        return self._const_snapshot
+    
+    def get_symbol_data(self, count=4096):
+        """Get the most recent symbols (at most the symbol sink capacity)"""
+        return self.symbol_sink.recent(count)
+    
+    def get_symbol_count(self):
+        """Get number of symbols received since the last reset"""
+        return self.symbol_sink.count
     
-    def get_symbol_data(self):
-        """Get raw symbol data"""
-        return list(self.vector_sink_symbols.data())
+    def get_bit_count(self):
+        """Get number of bits received since the last sink reset"""
+        return self.bit_count
     
     def get_symbol_sync_data(self):
         """Get symbol sync output data for analysis"""
-        return list(self.vector_sink_clock_recovery.data())
+        if not self.capture_plot_data:
+            return np.zeros(0, dtype=np.complex64)
+        return self.clock_recovery_sink.recent(self.clock_recovery_sink.capacity)
     
     def get_signal_power(self):
         """Get current signal power level"""
@@ -296,20 +416,19 @@ class PacketQPSKReceiver(gr.top_block):
     def reset_for_new_signal(self):
         """Reset receiver when new signal is detected"""
         try:
-            if self.debug:
-                print("Resetting receiver for new signal...")
+            logger.debug("Resetting receiver for new signal...")
             
             # Reset all data sinks
-            self.vector_sink_bits.reset()
-            self.vector_sink_symbols.reset()
-            self.vector_sink_constellation.reset()
-            self.vector_sink_clock_recovery.reset()
+            self.bit_count = 0
+            self.symbol_sink.reset()
+            if self.capture_plot_data:
+                self.constellation_sink.reset()
+                self.clock_recovery_sink.reset()
             
             # Clear packet decoder buffer
-            self.packet_decoder.bit_buffer.clear()
+            self.packet_decoder.reset()
             
-            if self.debug:
-                print("Receiver reset for new signal complete")
+            logger.debug("Receiver reset for new signal complete")
             
         except Exception as e:
             print(f"Error resetting for new signal: {e}")
@@ -3,7 +3,6 @@ QPSK Modulator for packet transmission
 """
 
 import numpy as np
-import time
 from gnuradio import gr, blocks, digital
 from ..common import create_constellation
 
@@ -21,21 +20,8 @@ class QpskPacketModulator(gr.top_block):
         # Create QPSK constellation
         self.constellation = create_constellation()
         
-        # Convert bit stream to bytes for GNU Radio
-        # Pad to byte boundary if necessary
-        padded_bits = np.copy(packet_bits)
-        if len(padded_bits) % 8 != 0:
-            padding = 8 - (len(padded_bits) % 8)
-            padded_bits = np.concatenate([padded_bits, np.zeros(padding, dtype=np.uint8)])
-        
-        # Convert bits to bytes
-        packet_bytes = []
-        for i in range(0, len(padded_bits), 8):
-            byte_bits = padded_bits[i:i+8]
-            byte_val = 0
-            for j, bit in enumerate(byte_bits):
-                byte_val |= (int(bit) << (7-j))
-            packet_bytes.append(byte_val)
+        # Convert bit stream to bytes for GNU Radio (MSB first, packbits zero-pads the last byte)
+        packet_bytes = np.packbits(np.asarray(packet_bits, dtype=np.uint8)).tolist()
         
         # Blocks
         self.packet_source = blocks.vector_source_b(packet_bytes, True)  # Repeat packet
@@ -52,12 +38,21 @@ class QpskPacketModulator(gr.top_block):
         )
         
         self.blocks_multiply_const = blocks.multiply_const_cc(0.3)
+        
+        # Bound the output: skip one packet period while the pulse-shaping filter settles,
+        # then keep four. The differential encoder's phase advance over four periods is a
+        # whole number of turns, so the captured signal repeats seamlessly.
+        self.period_samples = len(packet_bytes) * 8 // 2 * self.sps  # 2 bits per QPSK symbol
+        self.skiphead = blocks.skiphead(gr.sizeof_gr_complex * 1, self.period_samples)
+        self.head = blocks.head(gr.sizeof_gr_complex * 1, 4 * self.period_samples)
         self.vector_sink = blocks.vector_sink_c()
         
         # Connections
         self.connect((self.packet_source, 0), (self.digital_constellation_modulator, 0))
         self.connect((self.digital_constellation_modulator, 0), (self.blocks_multiply_const, 0))
-        self.connect((self.blocks_multiply_const, 0), (self.vector_sink, 0))
+        self.connect((self.blocks_multiply_const, 0), (self.skiphead, 0))
+        self.connect((self.skiphead, 0), (self.head, 0))
+        self.connect((self.head, 0), (self.vector_sink, 0))
 
 def create_packet_signal(message="HELLO FROM TX", sequence_number=0, 
                         sps=16, alpha=0.5, samp_rate=1e6, verbose=True):
@@ -93,18 +88,11 @@ def create_packet_signal(message="HELLO FROM TX", sequence_number=0,
     # Create the modulator flowgraph
     modulator = QpskPacketModulator(packet_bits, samp_rate, sps, alpha)
     
-    # Run the flowgraph to generate samples
-    modulator.start()
-    
-    # Let it run to generate samples - reduced time for faster operation
-    time.sleep(0.2)  # Reduced from 1.0s to 0.2s for faster generation
-    
-    # Stop and get the data
-    modulator.stop()
-    modulator.wait()
+    # Run the flowgraph until the head block has produced the requested samples
+    modulator.run()
     
     # Get the generated samples
-    samples = np.array(modulator.vector_sink.data())
+    samples = np.asarray(modulator.vector_sink.data(), dtype=np.complex64)
     
     if verbose:
         print(f"Generated {len(samples)} complex samples")
@@ -3,16 +3,28 @@ USRP-based QPSK transmitter
 """
 
 import time
+import signal
 import threading
+import numpy as np
+from collections import namedtuple
 from gnuradio import gr, blocks
 from ..common.usrp_config import setup_usrp_sink, print_usrp_info
 
+# Fixed transmit session settings, passed to tx_worker as keyword arguments
+TxConfig = namedtuple('TxConfig', 'usrp_args center_freq samp_rate gain antenna verbose')
+
+def _as_complex64(signal_data):
+    """Get signal_data as a contiguous complex64 array (GNU Radio's native sample type)"""
+    return np.ascontiguousarray(signal_data, dtype=np.complex64)
+
 class USRPTransmitter(gr.top_block):
     """GNU Radio flowgraph for USRP transmission"""
     
     def __init__(self, signal_data, usrp_args, center_freq, samp_rate, gain, antenna):
         gr.top_block.__init__(self)
         
+        signal_data = _as_complex64(signal_data)
+        
         # Create vector source with the signal data (repeat continuously)
         self.vector_source = blocks.vector_source_c(signal_data, True)
         
@@ -36,6 +48,8 @@ class USRPSingleShotTransmitter(gr.top_block):
     def __init__(self, signal_data, usrp_args, center_freq, samp_rate, gain, antenna):
         gr.top_block.__init__(self)
         
+        signal_data = _as_complex64(signal_data)
+        
         # Create vector source with the signal data (no repeat for single-shot)
         self.vector_source = blocks.vector_source_c(signal_data, False)
         
@@ -63,6 +77,33 @@ class USRPSingleShotTransmitter(gr.top_block):
         print(f"  Antenna: {self.antenna}")
         print(f"  Signal length: {self.signal_length} samples")
 
+class SingleShotTxPool:
+    """Keeps one single-shot transmitter alive so the USRP is only set up once"""
+    
+    _transmitter = None
+    _config = None
+    _lock = threading.RLock()  # Also held by tx_single_shot for a whole burst
+    
+    @classmethod
+    def get(cls, signal_data, usrp_args, center_freq, samp_rate, gain, antenna):
+        """Get the shared transmitter loaded with signal_data (rebuilt if the USRP config changed)"""
+        config = (usrp_args, center_freq, samp_rate, gain, antenna)
+        with cls._lock:
+            if cls._transmitter is None or cls._config != config:
+                cls._transmitter = USRPSingleShotTransmitter(signal_data, *config)
+                cls._config = config
+            else:
+                cls._transmitter.vector_source.set_data(_as_complex64(signal_data))
+                cls._transmitter.signal_length = len(signal_data)
+            return cls._transmitter
+    
+    @classmethod
+    def discard(cls):
+        """Drop the shared transmitter (e.g. after an error)"""
+        with cls._lock:
+            cls._transmitter = None
+            cls._config = None
+
 def tx_worker(modulated_signal, usrp_args="addr=192.168.10.81", center_freq=5e9, 
               samp_rate=1e6, gain=20, antenna="J2", stop_event=None, verbose=True):
     """
@@ -75,7 +116,7 @@ def tx_worker(modulated_signal, usrp_args="addr=192.168.10.81", center_freq=5e9,
         samp_rate: Sample rate in Hz
         gain: Transmit gain
         antenna: Antenna port
-        stop_event: Threading event to signal stop
+        stop_event: threading.Event or multiprocessing.Event to signal stop
         verbose: Print debug information
     """
     try:
@@ -95,9 +136,11 @@ def tx_worker(modulated_signal, usrp_args="addr=192.168.10.81", center_freq=5e9,
             print("Starting transmission...")
         transmitter.start()
         
-        # Keep transmitting until stop signal
-        while stop_event is None or not stop_event.is_set():
-            time.sleep(0.1)
+        # Keep transmitting until stop signal (or forever if there is none)
+        if stop_event is not None:
+            stop_event.wait()
+        else:
+            transmitter.wait()
         
         if verbose:
             print("Stopping transmission...")
@@ -112,6 +155,30 @@ def tx_worker(modulated_signal, usrp_args="addr=192.168.10.81", center_freq=5e9,
         if verbose:
             print("Transmission stopped")
 
+def tx_worker_shared(shm_name, num_samples, config, stop_event):
+    """
+    Run tx_worker in a child process on a complex64 signal held in shared memory
+    
+    Args:
+        shm_name: Name of the shared memory block holding the signal
+        num_samples: Number of complex64 samples in the block
+        config: TxConfig with the transmit settings
+        stop_event: multiprocessing.Event to signal stop
+    """
+    # The parent handles Ctrl+C and tells us to stop through stop_event; drop the
+    # parent's SIGTERM handler (inherited on fork) so terminate() really ends us
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    
+    from multiprocessing import shared_memory  # Python 3.8+, only needed on this path
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        modulated_signal = np.ndarray((num_samples,), dtype=np.complex64, buffer=shm.buf)
+        tx_worker(modulated_signal, stop_event=stop_event, **config._asdict())
+    finally:
+        modulated_signal = None  # Release the view before closing the block
+        shm.close()
+
 def tx_single_shot(modulated_signal, usrp_args="addr=192.168.10.81", center_freq=5e9, 
                    samp_rate=1e6, gain=20, antenna="J2", verbose=True):
     """
@@ -130,42 +197,46 @@ def tx_single_shot(modulated_signal, usrp_args="addr=192.168.10.81", center_freq
         True if successful, False otherwise
     """
     try:
-        if verbose:
-            print("Setting up single-shot USRP transmission...")
-        
-        # Create and start the single-shot transmitter
-        transmitter = USRPSingleShotTransmitter(
-            modulated_signal, usrp_args, center_freq, 
-            samp_rate, gain, antenna
-        )
-        
-        if verbose:
-            print(f"Transmitting {len(modulated_signal)} samples...")
-        
-        transmitter.start()
-        
-        # Calculate transmission time and wait for completion
-        transmission_time = len(modulated_signal) / samp_rate
-        buffer_time = 0.1  # Reduced buffer time for faster operation
-        total_time = transmission_time + buffer_time
-        
-        if verbose:
-            print(f"Transmission duration: {transmission_time:.3f}s + {buffer_time}s buffer")
-        
-        # Wait for transmission to complete
-        time.sleep(total_time)
-        
-        if verbose:
-            print("Stopping transmission...")
-        transmitter.stop()
-        transmitter.wait()
-        
-        if verbose:
-            print("Single-shot transmission completed")
-        
-        return True
+        # The flowgraph is shared, so only one burst may use it at a time
+        with SingleShotTxPool._lock:
+            if verbose:
+                print("Setting up single-shot USRP transmission...")
+            
+            # Get the shared single-shot transmitter (USRP stays set up between bursts)
+            transmitter = SingleShotTxPool.get(
+                modulated_signal, usrp_args, center_freq, 
+                samp_rate, gain, antenna
+            )
+            
+            if verbose:
+                print(f"Transmitting {len(modulated_signal)} samples...")
+            
+            transmitter.start()
+            try:
+                # Calculate transmission time and wait for completion
+                transmission_time = len(modulated_signal) / samp_rate
+                buffer_time = 0.1  # Reduced buffer time for faster operation
+                total_time = transmission_time + buffer_time
+                
+                if verbose:
+                    print(f"Transmission duration: {transmission_time:.3f}s + {buffer_time}s buffer")
+                
+                # Wait for transmission to complete
+                time.sleep(total_time)
+            finally:
+                # Always stop, even on KeyboardInterrupt, so the pooled graph is left idle
+                if verbose:
+                    print("Stopping transmission...")
+                transmitter.stop()
+                transmitter.wait()
+            
+            if verbose:
+                print("Single-shot transmission completed")
+            
+            return True
         
     except Exception as e:
+        SingleShotTxPool.discard()
         print(f"Error in tx_single_shot: {e}")
         import traceback
         traceback.print_exc()
@@ -5,23 +5,24 @@ QPSK Transmitter Application
 """
 
 import sys
-import time
 import signal
 import threading
+import multiprocessing
+import numpy as np
 from pathlib import Path
 
 # Add src directory to Python path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.transmitter.modulator import create_packet_signal
-from src.transmitter.transmitter import tx_worker
+from src.transmitter.transmitter import TxConfig, tx_worker, tx_worker_shared
 from src.common import (
     DEFAULT_SAMP_RATE, DEFAULT_CENTER_FREQ, DEFAULT_SPS, 
     DEFAULT_ALPHA, DEFAULT_GAIN, DEFAULT_USRP_TX_ADDR, DEFAULT_ANTENNA
 )
 
 # Global variables
-stop_signal = threading.Event()
+stop_signal = threading.Event()  # Set by the signal handler (a multiprocessing.Event can deadlock there)
 
 def signal_handler(sig, frame):
     """Handle Ctrl+C gracefully"""
@@ -45,18 +46,22 @@ def main():
     antenna = DEFAULT_ANTENNA
     message = "HELLO TX"  # Message to transmit
     
-    print("=" * 60)
-    print("PACKET-BASED QPSK TRANSMITTER WITH HAMMING CODE")
-    print("=" * 60)
-    print(f"Message: '{message}'")
-    print(f"Sample Rate: {samp_rate/1e6:.1f} MHz")
-    print(f"Center Frequency: {center_freq/1e9:.3f} GHz")
-    print(f"Gain: {gain} dB")
-    print(f"Samples per Symbol: {sps}")
-    print(f"Excess Bandwidth: {alpha}")
-    print(f"USRP Address: {usrp_addr}")
-    print(f"Antenna: {antenna}")
-    print("=" * 60)
+    # Print the banner in one write
+    sys.stdout.write("\n".join([
+        "=" * 60,
+        "PACKET-BASED QPSK TRANSMITTER WITH HAMMING CODE",
+        "=" * 60,
+        f"Message: '{message}'",
+        f"Sample Rate: {samp_rate/1e6:.1f} MHz",
+        f"Center Frequency: {center_freq/1e9:.3f} GHz",
+        f"Gain: {gain} dB",
+        f"Samples per Symbol: {sps}",
+        f"Excess Bandwidth: {alpha}",
+        f"USRP Address: {usrp_addr}",
+        f"Antenna: {antenna}",
+        "=" * 60,
+    ]) + "\n")
+    sys.stdout.flush()
     
     # Generate packet signal with error correction
     sequence_number = 0
@@ -68,38 +73,64 @@ def main():
         print("Error: No signal generated!")
         return
     
-    print(f"\nPacket signal generated successfully!")
-    print(f"Signal length: {len(modulated_signal)} samples")
-    print(f"Signal duration: {len(modulated_signal)/samp_rate:.3f} seconds")
-    
-    # Start transmission in a separate thread
-    tx_thread = threading.Thread(
-        target=tx_worker,
-        args=(modulated_signal,),
-        kwargs={
-            'usrp_args': usrp_addr,
-            'center_freq': center_freq,
-            'samp_rate': samp_rate,
-            'gain': gain,
-            'antenna': antenna,
-            'stop_event': stop_signal,
-            'verbose': True
-        }
+    sys.stdout.write(
+        f"\nPacket signal generated successfully!\n"
+        f"Signal length: {len(modulated_signal)} samples\n"
+        f"Signal duration: {len(modulated_signal)/samp_rate:.3f} seconds\n"
     )
+    sys.stdout.flush()
     
-    tx_thread.daemon = True
-    tx_thread.start()
-    
-    # Keep main thread alive
+    tx_config = TxConfig(usrp_addr, center_freq, samp_rate, gain, antenna, verbose=True)
     try:
-        print("\nTransmission started. Press Ctrl+C to stop.")
-        while not stop_signal.is_set():
-            time.sleep(0.1)
-    except KeyboardInterrupt:
-        stop_signal.set()
+        from multiprocessing import shared_memory  # Python 3.8+
+    except ImportError:
+        shared_memory = None
     
-    # Wait for transmission thread to finish
-    tx_thread.join(timeout=5.0)
+    shm = None
+    try:
+        if shared_memory is not None:
+            # Share the signal with the transmit process once instead of pickling it
+            shm = shared_memory.SharedMemory(create=True, size=modulated_signal.nbytes)
+            np.ndarray(modulated_signal.shape, dtype=np.complex64, buffer=shm.buf)[:] = modulated_signal
+            
+            # Start transmission in a separate process (keeps the TX path off this GIL)
+            tx_stop = multiprocessing.Event()
+            tx_task = multiprocessing.Process(
+                target=tx_worker_shared,
+                args=(shm.name, len(modulated_signal), tx_config, tx_stop)
+            )
+        else:
+            # No shared memory before Python 3.8: transmit from a thread instead
+            tx_stop = threading.Event()
+            tx_task = threading.Thread(
+                target=tx_worker,
+                args=(modulated_signal,),
+                kwargs=dict(tx_config._asdict(), stop_event=tx_stop)
+            )
+        
+        tx_task.daemon = True
+        tx_task.start()
+        
+        # Keep main thread alive
+        try:
+            print("\nTransmission started. Press Ctrl+C to stop.")
+            stop_signal.wait()  # The signal handler sets the event
+        except KeyboardInterrupt:
+            pass
+        tx_stop.set()
+        
+        # Wait for transmission to finish (a stuck process is terminated, then killed)
+        tx_task.join(timeout=5.0)
+        if shm is not None and tx_task.is_alive():
+            tx_task.terminate()
+            tx_task.join(timeout=1.0)
+            if tx_task.is_alive():
+                tx_task.kill()
+                tx_task.join()
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
     print("Transmitter application finished")
 
 if __name__ == '__main__':